@@ -3,5 +3,5 @@
 # Change to the backend directory
 cd "$(dirname "$0")/../backend"
 
-# Run the Flask application
-python app.py
\ No newline at end of file
+# Run the Flask application under Gunicorn with gevent workers
+exec gunicorn -c gunicorn.conf.py wsgi:app
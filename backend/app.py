@@ -1,60 +1,182 @@
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import orjson
+from werkzeug.exceptions import RequestEntityTooLarge
 from rule_based_detector import RuleBasedDetector
-import json
-from datetime import datetime
+from config import Config
+import threading
+import time
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (keys stay sorted like Flask's default)."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+app.config['MAX_CONTENT_LENGTH'] = Config.MAX_CONTENT_LENGTH
 CORS(app)  # Enable CORS for all routes
 
-# Initialize the detector
-detector = RuleBasedDetector()
+# The detector is built on first use (or by the Gunicorn post_worker_init hook), once per process
+_detector = None
+_detector_lock = threading.Lock()
+
+def get_detector():
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = RuleBasedDetector(cache_size=Config.ANALYSIS_CACHE_SIZE)
+    return _detector
+
+class ScanStats:
+    """Scan counts per risk level, updated and read together under one lock."""
+    
+    def __init__(self):
+        self._total = 0
+        self._by_level = {"low": 0, "medium": 0, "high": 0}
+        self._lock = threading.Lock()
+    
+    def record(self, risk_level):
+        with self._lock:
+            self._by_level[risk_level] += 1
+            self._total += 1
+    
+    def record_many(self, risk_levels):
+        """Record the risk levels of several scans under one lock."""
+        with self._lock:
+            for risk_level in risk_levels:
+                self._by_level[risk_level] += 1
+            self._total += len(risk_levels)
+    
+    def snapshot(self):
+        """Return (total, legitimate, suspicious, fraudulent) counts from one consistent read."""
+        with self._lock:
+            return self._total, self._by_level["low"], self._by_level["medium"], self._by_level["high"]
+
+class RecentDetections:
+    """Ring buffer of pre-allocated detection slots that are overwritten in place.
+    
+    Entries are already formatted for the frontend; the serialized feed is
+    memoized until the next insert.
+    """
+    
+    def __init__(self, size):
+        self._slots = [
+            {"title": "", "description": "", "risk_level": "", "time_ago": "Recently detected", "timestamp": 0.0}
+            for _ in range(size)
+        ]
+        self._size = size
+        self._head = 0
+        self._count = 0
+        self._version = 0
+        self._json_version = 0
+        self._json = b"[]"
+        self._lock = threading.Lock()
+    
+    def record(self, title, risk_level, timestamp):
+        with self._lock:
+            self._write(title, risk_level, timestamp)
+            self._version += 1
+    
+    def record_many(self, entries):
+        """Record a sequence of (title, risk_level, timestamp) entries under one lock."""
+        with self._lock:
+            # Older entries would be overwritten anyway, so only write the newest ones
+            for title, risk_level, timestamp in entries[-self._size:]:
+                self._write(title, risk_level, timestamp)
+            self._version += 1
+    
+    def _write(self, title, risk_level, timestamp):
+        slot = self._slots[self._head]
+        slot["title"] = title
+        slot["description"] = f"Detected as {risk_level} risk"
+        slot["risk_level"] = risk_level
+        slot["timestamp"] = timestamp
+        self._head = (self._head + 1) % self._size
+        if self._count < self._size:
+            self._count += 1
+    
+    def to_json(self):
+        with self._lock:
+            if self._json_version != self._version:
+                # Oldest first, same order the feed has always used
+                start = self._head - self._count
+                self._json = orjson.dumps([self._slots[(start + i) % self._size] for i in range(self._count)])
+                self._json_version = self._version
+            return self._json
 
 # In-memory storage for demo purposes (in production, use a database)
-detection_history = []
-stats = {
+recent_detections = RecentDetections(Config.RECENT_DETECTIONS_LIMIT)
+# Dashboard buckets: low risk counts as legitimate, medium as suspicious, high as fraudulent
+scan_stats = ScanStats()
+
+# Static data for demo - in production this would come from a database
+FRAUD_TYPES = [
+    {"name": "Fake Advisors", "icon": "fas fa-user-secret", "count": 24},
+    {"name": "Deepfakes", "icon": "fas fa-video", "count": 7},
+    {"name": "Social Media Tips", "icon": "fas fa-comments", "count": 43},
+    {"name": "Fake Apps", "icon": "fas fa-mobile-alt", "count": 15}
+]
+_FRAUD_TYPES_JSON = orjson.dumps(FRAUD_TYPES)
+
+# Dashboard payload before any scan has been recorded
+_EMPTY_DASHBOARD_JSON = orjson.dumps({
     "total_scans": 0,
-    "legitimate_count": 0,
-    "suspicious_count": 0,
-    "fraudulent_count": 0
-}
+    "legitimate_percent": 0,
+    "suspicious_percent": 0,
+    "fraudulent_percent": 0
+}, option=orjson.OPT_SORT_KEYS)
+
+def _json_bytes_response(body):
+    # Pre-serialized bodies skip the JSON provider. A new Response is built per
+    # request because Flask-CORS adds headers to the response object.
+    return app.response_class(body, mimetype='application/json', direct_passthrough=True)
+
+def _json_body():
+    # Read the body once without caching it on the request; non-object payloads are treated as empty
+    data = orjson.loads(request.get_data(cache=False) or b"{}")
+    return data if isinstance(data, dict) else {}
+
+def _text_title(text):
+    return "Text: " + (text[:100] + "..." if len(text) > 100 else text)
+
+@app.before_request
+def reject_oversized_body():
+    # Enforced here because the route handlers turn any exception (including 413) into a 500
+    if request.content_length is not None and request.content_length > Config.MAX_CONTENT_LENGTH:
+        raise RequestEntityTooLarge()
+
+@app.errorhandler(RequestEntityTooLarge)
+def handle_request_too_large(e):
+    return jsonify({"error": "Request body too large"}), 413
 
 @app.route('/api/analyze/text', methods=['POST'])
 def analyze_text():
     try:
-        data = request.get_json()
+        data = _json_body()
         text = data.get('text', '')
         source_platform = data.get('source_platform', '')
         content_type = data.get('content_type', '')
         
         if not text:
             return jsonify({"error": "No text provided"}), 400
+        if len(text) > Config.MAX_TEXT_LENGTH:
+            return jsonify({"error": "Text too long"}), 413
         
-        result = detector.analyze_text(text, source_platform, content_type)
+        result = get_detector().analyze_text(text, source_platform, content_type)
         
         # Update statistics
-        stats["total_scans"] += 1
-        if result["risk_score"] < 30:
-            stats["legitimate_count"] += 1
-        elif result["risk_score"] < 70:
-            stats["suspicious_count"] += 1
-        else:
-            stats["fraudulent_count"] += 1
-        
-        # Add to history
-        detection_history.append({
-            "timestamp": datetime.now().isoformat(),
-            "type": "text",
-            "content": text[:100] + "..." if len(text) > 100 else text,
-            "risk_score": result["risk_score"],
-            "risk_level": result["risk_level"],
-            "platform": source_platform
-        })
+        scan_stats.record(result["risk_level"])
         
-        # Keep only last 10 detections for demo
-        if len(detection_history) > 10:
-            detection_history.pop(0)
-            
+        # Add to history (overwrites the oldest slot once the buffer is full)
+        recent_detections.record(_text_title(text), result["risk_level"], time.time())
+
         return jsonify(result)
     
     except Exception as e:
@@ -63,53 +185,77 @@ def analyze_text():
 @app.route('/api/analyze/url', methods=['POST'])
 def analyze_url():
     try:
-        data = request.get_json()
+        data = _json_body()
         url = data.get('url', '')
         
         if not url:
             return jsonify({"error": "No URL provided"}), 400
+        if len(url) > Config.MAX_URL_LENGTH:
+            return jsonify({"error": "URL too long"}), 413
         
-        result = detector.analyze_url(url)
+        result = get_detector().analyze_url(url)
         
         # Update statistics
-        stats["total_scans"] += 1
-        if result["risk_score"] < 30:
-            stats["legitimate_count"] += 1
-        elif result["risk_score"] < 70:
-            stats["suspicious_count"] += 1
-        else:
-            stats["fraudulent_count"] += 1
-        
-        # Add to history
-        detection_history.append({
-            "timestamp": datetime.now().isoformat(),
-            "type": "url",
-            "content": url,
-            "risk_score": result["risk_score"],
-            "risk_level": result["risk_level"],
-            "platform": "website"
-        })
+        scan_stats.record(result["risk_level"])
         
-        # Keep only last 10 detections for demo
-        if len(detection_history) > 10:
-            detection_history.pop(0)
-            
+        # Add to history (overwrites the oldest slot once the buffer is full)
+        recent_detections.record("URL Analysis", result["risk_level"], time.time())
+
         return jsonify(result)
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/analyze/batch', methods=['POST'])
+def analyze_batch():
+    try:
+        data = _json_body()
+        items = data.get('items')
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "No items provided"}), 400
+        if len(items) > Config.MAX_BATCH_ITEMS:
+            return jsonify({"error": f"At most {Config.MAX_BATCH_ITEMS} items per batch"}), 413
+        
+        texts = []
+        for i, item in enumerate(items):
+            text = item.get('text', '') if isinstance(item, dict) else ''
+            if not text:
+                return jsonify({"error": f"No text provided for item {i}"}), 400
+            if len(text) > Config.MAX_TEXT_LENGTH:
+                return jsonify({"error": f"Text too long for item {i}"}), 413
+            texts.append(text)
+        
+        results = get_detector().analyze_batch(
+            texts,
+            [item.get('source_platform', '') for item in items],
+            [item.get('content_type', '') for item in items]
+        )
+        
+        # Update statistics and history once the whole batch has been analyzed
+        timestamp = time.time()
+        scan_stats.record_many([result["risk_level"] for result in results])
+        recent_detections.record_many([
+            (_text_title(text), result["risk_level"], timestamp)
+            for text, result in zip(texts, results)
+        ])
+        
+        return jsonify({"results": results})
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/check-advisor', methods=['POST'])
 def check_advisor():
     try:
-        data = request.get_json()
+        data = _json_body()
         name = data.get('name', '')
         registration_number = data.get('registration_number', '')
         
         if not name and not registration_number:
             return jsonify({"error": "Either name or registration number must be provided"}), 400
         
-        result = detector.check_advisor(name, registration_number)
+        result = get_detector().check_advisor(name, registration_number)
         return jsonify(result)
     
     except Exception as e:
@@ -118,13 +264,13 @@ def check_advisor():
 @app.route('/api/check-advisor-by-registration', methods=['POST'])
 def check_advisor_by_registration():
     try:
-        data = request.get_json()
+        data = _json_body()
         registration_number = data.get('registration_number', '')
         
         if not registration_number:
             return jsonify({"error": "Registration number must be provided"}), 400
         
-        result = detector.check_advisor("", registration_number)
+        result = get_detector().check_advisor("", registration_number)
         return jsonify(result)
     
     except Exception as e:
@@ -133,11 +279,16 @@ def check_advisor_by_registration():
 @app.route('/api/dashboard', methods=['GET'])
 def get_dashboard():
     try:
-        total = stats["total_scans"]
-        legitimate_pct = round((stats["legitimate_count"] / total * 100), 2) if total > 0 else 0
-        suspicious_pct = round((stats["suspicious_count"] / total * 100), 2) if total > 0 else 0
-        fraudulent_pct = round((stats["fraudulent_count"] / total * 100), 2) if total > 0 else 0
+        # Counts are maintained at scan time, so this is O(1) per request
+        total, legitimate, suspicious, fraudulent = scan_stats.snapshot()
+        if total == 0:
+            return _json_bytes_response(_EMPTY_DASHBOARD_JSON)
         
+        scale = 100 / total
+        legitimate_pct = round(legitimate * scale, 2)
+        suspicious_pct = round(suspicious * scale, 2)
+        fraudulent_pct = round(fraudulent * scale, 2)
+
         return jsonify({
             "total_scans": total,
             "legitimate_percent": legitimate_pct,
@@ -151,40 +302,14 @@ def get_dashboard():
 @app.route('/api/recent-detections', methods=['GET'])
 def get_recent_detections():
     try:
-        # Format the detections for the frontend
-        formatted_detections = []
-        for detection in detection_history:
-            title = f"{detection['type'].upper()} Analysis"
-            if detection['type'] == 'text':
-                title = f"Text: {detection['content']}"
-            
-            formatted_detections.append({
-                "title": title,
-                "description": f"Detected as {detection['risk_level']} risk",
-                "risk_level": detection['risk_level'],
-                "time_ago": "Recently detected"
-            })
-        
-        return jsonify(formatted_detections)
+        return _json_bytes_response(recent_detections.to_json())
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/fraud-types', methods=['GET'])
 def get_fraud_types():
-    try:
-        # Static data for demo - in production this would come from a database
-        fraud_types = [
-            {"name": "Fake Advisors", "icon": "fas fa-user-secret", "count": 24},
-            {"name": "Deepfakes", "icon": "fas fa-video", "count": 7},
-            {"name": "Social Media Tips", "icon": "fas fa-comments", "count": 43},
-            {"name": "Fake Apps", "icon": "fas fa-mobile-alt", "count": 15}
-        ]
-        
-        return jsonify(fraud_types)
-    
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return _json_bytes_response(_FRAUD_TYPES_JSON)
 
 if __name__ == '__main__':
-    app.run(debug=True, port=8000)
+    app.run(port=8000)
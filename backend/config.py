@@ -8,10 +8,19 @@ class Config:
     
     # API configuration
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max content length
+    MAX_TEXT_LENGTH = 64_000  # Max characters analyzed per text scan
+    MAX_URL_LENGTH = 2048  # Max characters analyzed per URL scan
+    MAX_BATCH_ITEMS = 500  # Max texts per /api/analyze/batch request
     
     # Detection thresholds
     HIGH_RISK_THRESHOLD = 70
     MEDIUM_RISK_THRESHOLD = 30
     
+    # Number of scans kept for the recent detections feed
+    RECENT_DETECTIONS_LIMIT = 10
+    
+    # Number of analysis results memoized per worker (text and URL each)
+    ANALYSIS_CACHE_SIZE = 4096
+    
     # External API keys (if needed in the future)
     # WHOIS_API_KEY = os.getenv('WHOIS_API_KEY', '')
\ No newline at end of file
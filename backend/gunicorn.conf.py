@@ -0,0 +1,29 @@
+import os
+
+# Bind address for the API (frontend expects port 8000)
+bind = os.getenv('MARKETGUARD_BIND', '0.0.0.0:8000')
+
+# gevent workers multiplex concurrent requests on greenlets.
+# Set GUNICORN_WORKER_CLASS=sync if the detector ever calls C extensions
+# that gevent cannot patch.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent')
+# One worker by default: the dashboard counters and recent-detections feed live in
+# process memory, so with several workers each poll would only see one worker's share.
+# Scale concurrency through worker_connections until those stats move to shared storage
+workers = int(os.getenv('WEB_CONCURRENCY', 1))
+
+# Each gevent worker serves up to worker_connections concurrent clients, so
+# the server holds at most workers * worker_connections open connections.
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Keep idle HTTP/1.1 connections open so the dashboard's polling requests
+# reuse them instead of reconnecting every time.
+keepalive = 15
+
+
+def post_worker_init(worker):
+    # Load the detector's rule tables before the worker accepts requests.
+    # This runs after the app (and gevent's monkey patching) is loaded,
+    # unlike post_fork, which would import Flask before patching.
+    from app import get_detector
+    get_detector()
@@ -1,12 +1,278 @@
 import re
+import bisect
+import sys
 import json
+import string
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Dict, List, Tuple
-from urllib.parse import urlparse
 import requests
 from datetime import datetime
+from config import Config
 
-class RuleBasedDetector:
+try:
+    import ahocorasick
+except ImportError:  # Optional: keyword and domain matching fall back to KeywordTrie
+    ahocorasick = None
+
+try:
+    import re2
+except ImportError:  # Optional: regexes on user input fall back to the backtracking re module
+    re2 = None
+
+try:
+    import hyperscan
+except ImportError:  # Optional: suspicious URL patterns fall back to the compiled re path
+    hyperscan = None
+
+# Hyperscan misses some matches re finds (r"!\s*!" after 15 other characters, for one), so its
+# databases are only used if they agree with the regular matchers on samples behind these prefixes
+_HYPERSCAN_PROBE_PREFIXES = ("", "x" * 15 + " ", "word " * 64)
+
+# Text is treated as shouting when more than this share of its ASCII letters are uppercase
+CAPS_RATIO_THRESHOLD = 0.3
+# ...and it has at least this many letters (so "I" or "NASA" alone don't count)
+CAPS_MIN_LETTERS = 10
+
+_ASCII_LETTERS = string.ascii_letters.encode()
+_ASCII_UPPERCASE = string.ascii_uppercase.encode()
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+def _has_excessive_caps(text: str) -> bool:
+    # bytes.translate deletes the given bytes in one C-level pass; the length drop is the count
+    data = text.encode("ascii", "ignore")
+    letters = len(data) - len(data.translate(None, _ASCII_LETTERS))
+    if letters < CAPS_MIN_LETTERS:
+        return False
+    uppercase = len(data) - len(data.translate(None, _ASCII_UPPERCASE))
+    return uppercase > letters * CAPS_RATIO_THRESHOLD
+
+def _compile_linear(pattern: str, ignore_case: bool = False):
+    """
+    Compile a regex that runs on user-supplied text with RE2 (linear time, no backtracking)
+    when it is installed, falling back to re if RE2 is missing or rejects the pattern.
+    The fallback uses ASCII word boundaries, digits and whitespace like RE2, so both engines
+    agree (except that RE2 does not count a vertical tab as whitespace)
+    """
+    if re2 is not None:
+        try:
+            return re2.compile("(?i)" + pattern if ignore_case else pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern, re.ASCII | re.IGNORECASE if ignore_case else re.ASCII)
+
+def _normalize_score(risk_score: float, platform_modifier: float, content_modifier: float,
+                     max_possible_score: float) -> float:
+    """
+    Apply platform/content modifiers to a summed indicator weight and scale it to 0-100
+    """
+    if max_possible_score <= 0:
+        return 0.0
+    # Platform and content type modifiers can add up to 0.7 or subtract up to 0.3
+    adjusted_score = risk_score * (1 + platform_modifier + content_modifier)
+    return max(0.0, min(100.0, (adjusted_score / max_possible_score) * 100))
+
+def _normalize_scores(hits: np.ndarray, weights: np.ndarray, platform_modifiers: np.ndarray,
+                      content_modifiers: np.ndarray, max_possible_score: float) -> np.ndarray:
+    """
+    _normalize_score for a batch: hits[i, j] is 1.0 when text i matched pattern j.
+    Works in place on the product and modifier buffers, so only two arrays are allocated
+    """
+    if max_possible_score <= 0:
+        return np.zeros(hits.shape[0])
+    scores = hits @ weights
+    multipliers = platform_modifiers + 1.0
+    multipliers += content_modifiers
+    scores *= multipliers
+    scores /= max_possible_score
+    scores *= 100
+    return np.clip(scores, 0.0, 100.0, out=scores)
+
+def _record_hyperscan_match(pattern_id, start, end, flags, context):
+    context.append(pattern_id)
+
+def _regex_samples(pattern: str) -> Tuple[str, str]:
+    """
+    Rough literal samples of a regex for the hyperscan self-test: character classes and
+    escapes become one space, then nothing, and quantifiers are dropped, so "bitcoin.*double"
+    gives "bitcoin double" and "bitcoindouble"
+    """
+    pattern = re.sub(r"[*+?()\[\]{}|^$]", "", re.sub(r"\\[A-Za-z]|\.", "\0", pattern))
+    return pattern.replace("\0", " "), pattern.replace("\0", "")
+
+class KeywordTrie:
+    """
+    Pure-Python stand-in for ahocorasick.Automaton, used when pyahocorasick isn't installed.
+    Supports the subset the detector uses: add_word, make_automaton and iter, which yields
+    (end_index, value) for every occurrence of every word, overlapping ones included
+    """
+    
+    _END = ""  # Never a single character, so it can't collide with a child key
+    
     def __init__(self):
+        self._root = {}
+    
+    def add_word(self, word: str, value) -> None:
+        node = self._root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[self._END] = value
+    
+    def make_automaton(self) -> None:
+        pass  # Nothing to link: iter walks the trie from every start position
+    
+    def iter(self, text: str):
+        root = self._root
+        end_key = self._END
+        text_length = len(text)
+        for start in range(text_length):
+            node = root.get(text[start])
+            position = start
+            while node is not None:
+                if end_key in node:
+                    yield position, node[end_key]
+                position += 1
+                if position == text_length:
+                    break
+                node = node.get(text[position])
+
+def _new_automaton():
+    return ahocorasick.Automaton() if ahocorasick is not None else KeywordTrie()
+
+@dataclass
+class Indicator:
+    """
+    A fraud or legitimacy pattern found in analyzed text. Slotted, so no per-instance
+    __dict__; orjson serializes it directly as a JSON object
+    """
+    __slots__ = ("type", "pattern", "description", "weight", "evidence")
+    type: str
+    pattern: str
+    description: str
+    weight: float
+    evidence: str
+
+def _advisor_results(advisors_by_reg: Dict[str, Dict], active_risk_score: int,
+                     inactive_risk_score: int) -> Dict[str, Dict]:
+    """
+    Build the check_advisor result for each known advisor, keyed by registration number
+    """
+    results = {}
+    for registration_id, advisor in advisors_by_reg.items():
+        active = advisor["status"] == "active"
+        recommendation = f"This advisor is registered and {advisor['status']}. "
+        if active:
+            recommendation += f"Registration valid until {advisor['valid_until']}."
+        else:
+            recommendation += "Do not engage with suspended advisors."
+        
+        results[registration_id] = {
+            "registered": active,
+            "status": advisor["status"],
+            "details": advisor,
+            "risk_score": active_risk_score if active else inactive_risk_score,
+            "risk_level": "low" if active else "high",
+            "recommendation": recommendation
+        }
+    return results
+
+def _advisor_results_by_name(registration_ids_by_name: Dict[str, str],
+                             results_by_reg: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    Key check_advisor results by normalized advisor name, skipping unregistered names
+    """
+    return {
+        name: results_by_reg[registration_id]
+        for name, registration_id in registration_ids_by_name.items()
+        if registration_id in results_by_reg
+    }
+
+class ResultCache:
+    """
+    Small thread-safe LRU cache for analysis results
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            return result
+    
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+class RuleBasedDetector:
+    # Mock database of legitimate advisors (in reality, this would be an external API call)
+    _LEGIT_BY_REG = {
+        "IN123456": {"name": "John Smith", "status": "active", "type": "Equity Advisor", "valid_until": "2025-12-31"},
+        "IN654321": {"name": "Jane Doe", "status": "active", "type": "Research Analyst", "valid_until": "2024-11-15"},
+        "US789012": {"name": "Robert Brown", "status": "active", "type": "Investment Advisor", "valid_until": "2026-03-20"},
+        "IN987654": {"name": "Sarah Johnson", "status": "suspended", "type": "Wealth Manager", "valid_until": "2024-08-10"},
+        "IN246810": {"name": "Michael Chen", "status": "active", "type": "Portfolio Manager", "valid_until": "2025-06-30"},
+    }
+    # Lowercased advisor names -> registration number
+    _LEGIT_BY_NAME = {
+        "john smith": "IN123456",
+        "jane doe": "IN654321",
+        "robert brown": "US789012",
+        "sarah johnson": "IN987654",
+        "michael chen": "IN246810",
+        "david wilson": None,  # Not registered
+        "emma thompson": None  # Not registered
+    }
+    
+    # check_advisor results, built once. A name match is trusted slightly less than a registration number
+    _ADVISOR_RESULTS_BY_REG = _advisor_results(_LEGIT_BY_REG, active_risk_score=10, inactive_risk_score=70)
+    _ADVISOR_RESULTS_BY_NAME = _advisor_results_by_name(
+        _LEGIT_BY_NAME, _advisor_results(_LEGIT_BY_REG, active_risk_score=15, inactive_risk_score=75)
+    )
+    _REG_NOT_FOUND_RESULT = {
+        "registered": False,
+        "status": "not_found",
+        "risk_score": 90,
+        "risk_level": "high",
+        "recommendation": "This registration number was not found in our database. Verify with official regulatory authorities."
+    }
+    _NAME_NOT_FOUND_RESULT = {
+        "registered": False,
+        "status": "not_found",
+        "risk_score": 80,
+        "risk_level": "high",
+        "recommendation": "This advisor name was not found in our database. Verify with official regulatory authorities."
+    }
+    
+    # Risk levels and recommendations are indexed by bisect_right(_RISK_THRESHOLDS, score):
+    # 0 below the medium threshold, 1 below the high threshold, else 2
+    _RISK_THRESHOLDS = (Config.MEDIUM_RISK_THRESHOLD, Config.HIGH_RISK_THRESHOLD)
+    _RISK_LEVELS = ("low", "medium", "high")
+    _TEXT_RECOMMENDATIONS = (
+        "This content appears to be legitimate with no significant fraud indicators detected.",
+        "This content shows some suspicious patterns that require further verification.",
+        "This content displays multiple characteristics commonly associated with fraudulent activity."
+    )
+    _PRIVATE_MESSAGING_ADVICE = " Be especially cautious of investment advice received through private messaging platforms."
+    _PLATFORM_ADVICE = {"whatsapp": _PRIVATE_MESSAGING_ADVICE, "telegram": _PRIVATE_MESSAGING_ADVICE}
+    _URL_RECOMMENDATIONS = (
+        "This URL does not appear to be associated with known fraud patterns.",
+        "This URL shows some suspicious characteristics. Exercise caution.",
+        "This URL matches known fraudulent patterns. Avoid interacting with this site."
+    )
+    
+    def __init__(self, cache_size: int = 4096):
         # Define fraud patterns with weights
         self.patterns = {
             "urgency_language": {
@@ -34,7 +300,8 @@ class RuleBasedDetector:
                 "description": "Pressures specific payment methods that are hard to trace"
             },
             "grammar_errors": {
-                "patterns": [r"\b[A-Z]+\b", r"!\s*!"],  # ALL CAPS, multiple exclamation marks
+                "patterns": [r"!\s*!"],  # Multiple exclamation marks
+                "checks": [_has_excessive_caps],  # Mostly-uppercase text
                 "weight": 0.5,
                 "description": "Excessive capitalization or punctuation typical in scams"
             },
@@ -112,117 +379,322 @@ class RuleBasedDetector:
             "document": -0.1,
             "other": 0.0
         }
+        
+        # Struct-of-arrays view of both pattern tables, indexed by pattern id (fraud patterns
+        # first, then legitimacy indicators, in table order). Detection works on pattern ids
+        # and indicator dicts are only built for the ids that were hit
+        self._pattern_names = []
+        self._pattern_types = []
+        self._pattern_descriptions = []
+        self._pattern_weight_values = []
+        pattern_keywords = []
+        self._category_regexes = []
+        self._category_checks = []
+        for pattern_type, table in (("fraud", self.patterns), ("legitimacy", self.legitimacy_indicators)):
+            for pattern_name, pattern_data in table.items():
+                pattern_id = len(self._pattern_names)
+                # Interned so every detector (and every indicator) shares one copy of each string
+                self._pattern_names.append(sys.intern(pattern_name))
+                self._pattern_types.append(sys.intern(pattern_type))
+                self._pattern_descriptions.append(sys.intern(pattern_data["description"]))
+                self._pattern_weight_values.append(pattern_data["weight"])
+                if "keywords" in pattern_data:
+                    pattern_keywords.append((pattern_id, pattern_data["keywords"]))
+                elif "patterns" in pattern_data:
+                    # Regex categories count once on any match, so each category's patterns are
+                    # fused into one capture-free regex that only needs a single search(). Run on
+                    # the original text without IGNORECASE
+                    self._category_regexes.append((pattern_id, _compile_linear(
+                        "|".join(f"(?:{p})" for p in pattern_data["patterns"])
+                    )))
+                    if "checks" in pattern_data:
+                        self._category_checks.append((pattern_id, tuple(pattern_data["checks"])))
+        # analyze_batch scores many texts with one matrix-vector product over these weights
+        self._pattern_weights = np.array(self._pattern_weight_values, dtype=np.float64)
+        
+        # One automaton over the keywords of every fraud/legitimacy pattern, so analyze_text
+        # finds all keyword hits in a single pass. Payload: (pattern_id, keyword_rank, keyword).
+        # The standard (unicode) pyahocorasick build only takes str keys, so the scan runs on the
+        # lowercased str; ASCII text is already stored one byte per character
+        self._keyword_automaton = _new_automaton()
+        for pattern_id, keywords in pattern_keywords:
+            for rank, keyword in enumerate(keywords):
+                # The payload keyword is reused as the indicator's evidence string
+                self._keyword_automaton.add_word(keyword, (pattern_id, rank, sys.intern(keyword)))
+        self._keyword_automaton.make_automaton()
+        
+        # With hyperscan installed, keywords in ASCII text (the common case) are matched by one
+        # SIMD scan instead. SINGLEMATCH reports each keyword at most once, and on ASCII text
+        # a \b on either side is the same token boundary _find_keyword_hits checks.
+        # Payload per expression id: (pattern_id, keyword_rank, keyword)
+        self._keyword_hs_db = None
+        if hyperscan is not None:
+            self._keyword_hs_payloads = [
+                (pattern_id, rank, sys.intern(keyword))
+                for pattern_id, keywords in pattern_keywords
+                for rank, keyword in enumerate(keywords)
+            ]
+            self._keyword_hs_db = hyperscan.Database()
+            self._keyword_hs_db.compile(
+                expressions=[rf"\b{re.escape(keyword)}\b".encode() for _, _, keyword in self._keyword_hs_payloads],
+                ids=list(range(len(self._keyword_hs_payloads))),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(self._keyword_hs_payloads)
+            )
+            self._keyword_hs_lock = threading.Lock()
+        
+        # Each suspicious URL pattern adds risk separately, so keep them individually compiled
+        # and use their union to skip the per-pattern checks on clean URLs. Compiled with
+        # IGNORECASE so they run on the URL as given instead of a lowercased copy
+        self._suspicious_url_regexes = [_compile_linear(p, ignore_case=True) for p in self.suspicious_url_patterns]
+        self._suspicious_url_union = _compile_linear(
+            "|".join(f"(?:{p})" for p in self.suspicious_url_patterns), ignore_case=True
+        )
+        # With hyperscan installed, all suspicious URL patterns are matched in a single scan.
+        # SINGLEMATCH reports each pattern at most once, like one re.search per pattern
+        self._url_hs_db = None
+        if hyperscan is not None:
+            self._url_hs_db = hyperscan.Database()
+            self._url_hs_db.compile(
+                expressions=[p.encode() for p in self.suspicious_url_patterns],
+                ids=list(range(len(self.suspicious_url_patterns))),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(self.suspicious_url_patterns)
+            )
+            # The database's scratch space can only be used by one scan at a time
+            self._url_hs_lock = threading.Lock()
+        self._verify_hyperscan()
+        self._ip_address_re = re.compile(r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}")
+        
+        # Known fraudulent domains are matched anywhere in the domain with one automaton pass
+        self._fraud_domain_automaton = _new_automaton()
+        for fraud_domain in self.known_fraudulent_domains:
+            self._fraud_domain_automaton.add_word(fraud_domain, fraud_domain)
+        self._fraud_domain_automaton.make_automaton()
+        
+        # Domain labels that suggest a freshly registered domain (simplified check for demo)
+        self._new_domain_tokens = frozenset(["new", "latest", "2024", "2025"])
+        self._domain_split_re = re.compile(r"[.\-:]")
+        
+        # Scoring constants: the fraud pattern tables are fixed once the detector is built
+        self._max_possible_score = sum(pattern_data["weight"] for pattern_data in self.patterns.values())
+        self._platform_modifier_get = self.platform_risk_modifiers.get
+        self._content_modifier_get = self.content_type_modifiers.get
+        
+        # Most legitimate texts match no pattern at all. Their result only depends on the
+        # platform and content type, so it is built once for every known combination
+        self._clean_text_results = {
+            (source_platform, content_type): self._text_result(
+                [], 0.0, source_platform,
+                self._platform_modifier_get(source_platform, 0.0), self._content_modifier_get(content_type, 0.0)
+            )
+            for source_platform in ["", *self.platform_risk_modifiers]
+            for content_type in ["", *self.content_type_modifiers]
+        }
+        
+        # Analyses are pure functions of their inputs, so results are memoized per detector
+        self._text_results = ResultCache(cache_size)
+        self._url_results = ResultCache(cache_size)
+
+    def _find_keyword_hits(self, text_lower: str) -> Dict[int, str]:
+        """
+        Map the id of each pattern with a keyword in the text to its evidence keyword
+        (the first one in the pattern's keyword list, as the per-pattern loops reported).
+        Keywords only count as whole tokens, so "no risk" does not fire inside "know risk"
+        """
+        hits = {}
+        text_end = len(text_lower) - 1
+        for end, (pattern_id, rank, keyword) in self._keyword_automaton.iter(text_lower):
+            start = end - len(keyword) + 1
+            if start > 0 and _is_word_char(text_lower[start - 1]):
+                continue
+            if end < text_end and _is_word_char(text_lower[end + 1]):
+                continue
+            best = hits.get(pattern_id)
+            if best is None or rank < best[0]:
+                hits[pattern_id] = (rank, keyword)
+        return {pattern_id: keyword for pattern_id, (_, keyword) in hits.items()}
 
     def analyze_text(self, text: str, source_platform: str = "", content_type: str = "") -> Dict:
         """
-        Analyze text for fraud indicators and return a risk assessment
+        Analyze text for fraud indicators and return a risk assessment.
+        Results are cached and shared between callers, so treat them as read-only
         """
         if not text:
             return {"error": "No text provided for analysis"}
         
-        text_lower = text.lower()
+        key = self._text_cache_key(text, source_platform, content_type)
+        result = self._text_results.get(key)
+        if result is None:
+            result = self._analyze_text(text, source_platform, content_type)
+            self._text_results.put(key, result)
+        return result
+    
+    def analyze_batch(self, texts: List[str], source_platforms: List[str] = None,
+                      content_types: List[str] = None) -> List[Dict]:
+        """
+        Analyze many texts at once and return one result per text, in order.
+        Texts not already cached are scored together with a single matrix-vector product
+        """
+        source_platforms = source_platforms or [""] * len(texts)
+        content_types = content_types or [""] * len(texts)
         
-        # Initialize results
-        detected_indicators = []
-        risk_score = 0.0
-        max_possible_score = 0.0
+        results = [None] * len(texts)
+        keys = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            if not text:
+                results[i] = {"error": "No text provided for analysis"}
+                continue
+            keys[i] = self._text_cache_key(text, source_platforms[i], content_types[i])
+            results[i] = self._text_results.get(keys[i])
+            if results[i] is None:
+                pending.append(i)
         
-        # Check for fraud patterns
-        for pattern_name, pattern_data in self.patterns.items():
-            pattern_weight = pattern_data["weight"]
-            max_possible_score += pattern_weight
-            
-            # Check keyword-based patterns
-            if "keywords" in pattern_data:
-                for keyword in pattern_data["keywords"]:
-                    if keyword in text_lower:
-                        detected_indicators.append({
-                            "type": "fraud",
-                            "pattern": pattern_name,
-                            "description": pattern_data["description"],
-                            "weight": pattern_weight,
-                            "evidence": keyword
-                        })
-                        risk_score += pattern_weight
-                        break  # Only count each pattern once
-            
-            # Check regex patterns
-            elif "patterns" in pattern_data:
-                for regex_pattern in pattern_data["patterns"]:
-                    if re.search(regex_pattern, text):
-                        detected_indicators.append({
-                            "type": "fraud",
-                            "pattern": pattern_name,
-                            "description": pattern_data["description"],
-                            "weight": pattern_weight,
-                            "evidence": "Pattern match"
-                        })
-                        risk_score += pattern_weight
-                        break  # Only count each pattern once
-        
-        # Check for legitimacy indicators (reduce risk)
-        for indicator_name, indicator_data in self.legitimacy_indicators.items():
-            indicator_weight = indicator_data["weight"]
-            
-            # Check keyword-based legitimacy indicators
-            if "keywords" in indicator_data:
-                for keyword in indicator_data["keywords"]:
-                    if keyword in text_lower:
-                        detected_indicators.append({
-                            "type": "legitimacy",
-                            "pattern": indicator_name,
-                            "description": indicator_data["description"],
-                            "weight": indicator_weight,
-                            "evidence": keyword
-                        })
-                        risk_score += indicator_weight  # This subtracts because weight is negative
-                        break
-            
-            # Check regex patterns for legitimacy
-            elif "patterns" in indicator_data:
-                for regex_pattern in indicator_data["patterns"]:
-                    if re.search(regex_pattern, text):
-                        detected_indicators.append({
-                            "type": "legitimacy",
-                            "pattern": indicator_name,
-                            "description": indicator_data["description"],
-                            "weight": indicator_weight,
-                            "evidence": "Pattern match"
-                        })
-                        risk_score += indicator_weight  # This subtracts because weight is negative
-                        break
+        if not pending:
+            return results
         
-        # Apply platform and content type modifiers
-        platform_modifier = self.platform_risk_modifiers.get(source_platform, 0.0)
-        content_modifier = self.content_type_modifiers.get(content_type, 0.0)
+        evidence, scores, platform_modifiers, content_modifiers = self._score_texts(
+            [texts[i] for i in pending],
+            [source_platforms[i] for i in pending],
+            [content_types[i] for i in pending]
+        )
+        
+        for row, i in enumerate(pending):
+            results[i] = self._text_result(
+                self._build_indicators(evidence[row]), float(scores[row]), source_platforms[i],
+                float(platform_modifiers[row]), float(content_modifiers[row])
+            )
+            self._text_results.put(keys[i], results[i])
+        return results
+    
+    def score_batch(self, texts: List[str], source_platforms: List[str] = None,
+                    content_types: List[str] = None) -> np.ndarray:
+        """
+        Return just the risk score (0-100, unrounded) of each text as an array, for bulk
+        scoring where indicators and recommendations aren't needed. Empty texts score NaN.
+        Skips the result cache, so nothing is built or stored per text
+        """
+        source_platforms = source_platforms or [""] * len(texts)
+        content_types = content_types or [""] * len(texts)
         
-        # Adjust risk score with modifiers (platform and content type can add up to 0.4)
-        adjusted_score = risk_score * (1 + platform_modifier + content_modifier)
+        scores = np.full(len(texts), np.nan)
+        rows = [i for i, text in enumerate(texts) if text]
+        if rows:
+            _, scores[rows], _, _ = self._score_texts(
+                [texts[i] for i in rows],
+                [source_platforms[i] for i in rows],
+                [content_types[i] for i in rows]
+            )
+        return scores
+    
+    def _score_texts(self, texts: List[str], source_platforms: List[str],
+                     content_types: List[str]) -> Tuple[List[Dict[int, str]], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Detect patterns in each non-empty text and score them all with one matrix-vector product.
+        Returns each text's evidence plus the scores, platform modifiers and content modifiers
+        """
+        # hits[row, pattern_id] is 1.0 when the pattern was detected in that text
+        hits = np.zeros((len(texts), len(self._pattern_names)), dtype=np.float64)
+        evidence = []
+        for row, text in enumerate(texts):
+            text_evidence = self._detect_patterns(text)
+            evidence.append(text_evidence)
+            hits[row, list(text_evidence)] = 1.0
+        
+        platform_get = self._platform_modifier_get
+        content_get = self._content_modifier_get
+        platform_modifiers = np.array([platform_get(source_platform, 0.0) for source_platform in source_platforms])
+        content_modifiers = np.array([content_get(content_type, 0.0) for content_type in content_types])
+        
+        scores = _normalize_scores(hits, self._pattern_weights, platform_modifiers, content_modifiers,
+                                   self._max_possible_score)
+        return evidence, scores, platform_modifiers, content_modifiers
+    
+    @staticmethod
+    def _text_cache_key(text: str, source_platform: str, content_type: str) -> Tuple:
+        # Key on a digest rather than the text itself so long inputs don't pin memory
+        return (hashlib.sha1(text.encode("utf-8", "surrogatepass")).digest(), len(text), source_platform, content_type)
+    
+    def _analyze_text(self, text: str, source_platform: str, content_type: str) -> Dict:
+        evidence = self._detect_patterns(text)
+        if not evidence:
+            clean_result = self._clean_text_results.get((source_platform, content_type))
+            if clean_result is not None:
+                return clean_result
+        
+        weights = self._pattern_weight_values
+        risk_score = 0.0
+        for pattern_id in evidence:
+            risk_score += weights[pattern_id]  # Legitimacy weights are negative and reduce the score
+        
+        # Apply platform and content type modifiers
+        platform_modifier = self._platform_modifier_get(source_platform, 0.0)
+        content_modifier = self._content_modifier_get(content_type, 0.0)
         
-        # Normalize risk score to 0-100 range
-        if max_possible_score > 0:
-            normalized_score = max(0, min(100, (adjusted_score / max_possible_score) * 100))
+        normalized_score = _normalize_score(risk_score, platform_modifier, content_modifier, self._max_possible_score)
+        return self._text_result(self._build_indicators(evidence), normalized_score, source_platform,
+                                 platform_modifier, content_modifier)
+    
+    def _detect_patterns(self, text: str) -> Dict[int, str]:
+        """
+        Map the id of each fraud/legitimacy pattern found in the text to its evidence,
+        in pattern id order
+        """
+        if self._keyword_hs_db is not None and text.isascii():
+            evidence = self._find_keyword_hits_hyperscan(text)
         else:
-            normalized_score = 0
+            evidence = self._find_keyword_hits(text.lower())
+        
+        # search() stops at a category's first match, so contact-heavy text isn't walked match by match
+        for pattern_id, regex in self._category_regexes:
+            if regex.search(text):
+                evidence[pattern_id] = "Pattern match"
+        
+        # Non-regex checks only run for categories the regex didn't already match
+        for pattern_id, checks in self._category_checks:
+            if pattern_id not in evidence and any(check(text) for check in checks):
+                evidence[pattern_id] = "Pattern match"
+        return {pattern_id: evidence[pattern_id] for pattern_id in sorted(evidence)}
+    
+    def _find_keyword_hits_hyperscan(self, ascii_text: str) -> Dict[int, str]:
+        """
+        _find_keyword_hits for ASCII text, from a single case-insensitive hyperscan pass
+        """
+        matches = []
+        with self._keyword_hs_lock:
+            self._keyword_hs_db.scan(ascii_text.encode("ascii"), match_event_handler=_record_hyperscan_match,
+                                     context=matches)
         
+        payloads = self._keyword_hs_payloads
+        hits = {}
+        for expression_id in matches:
+            pattern_id, rank, keyword = payloads[expression_id]
+            best = hits.get(pattern_id)
+            if best is None or rank < best[0]:
+                hits[pattern_id] = (rank, keyword)
+        return {pattern_id: keyword for pattern_id, (_, keyword) in hits.items()}
+    
+    def _build_indicators(self, evidence: Dict[int, str]) -> List[Indicator]:
+        names = self._pattern_names
+        types = self._pattern_types
+        descriptions = self._pattern_descriptions
+        weights = self._pattern_weight_values
+        # Indicators reference the interned table strings; nothing is copied from the text
+        return [
+            Indicator(types[pattern_id], names[pattern_id], descriptions[pattern_id], weights[pattern_id], keyword)
+            for pattern_id, keyword in evidence.items()
+        ]
+    
+    def _text_result(self, detected_indicators: List[Indicator], normalized_score: float, source_platform: str,
+                     platform_modifier: float, content_modifier: float) -> Dict:
         # Determine risk level
-        if normalized_score < 30:
-            risk_level = "low"
-            recommendation = "This content appears to be legitimate with no significant fraud indicators detected."
-        elif normalized_score < 70:
-            risk_level = "medium"
-            recommendation = "This content shows some suspicious patterns that require further verification."
-        else:
-            risk_level = "high"
-            recommendation = "This content displays multiple characteristics commonly associated with fraudulent activity."
+        level = bisect.bisect_right(self._RISK_THRESHOLDS, normalized_score)
         
         # Add platform-specific advice
-        if source_platform in ["whatsapp", "telegram"]:
-            recommendation += " Be especially cautious of investment advice received through private messaging platforms."
+        recommendation = self._TEXT_RECOMMENDATIONS[level] + self._PLATFORM_ADVICE.get(source_platform, "")
         
         return {
             "risk_score": round(normalized_score, 2),
-            "risk_level": risk_level,
+            "risk_level": self._RISK_LEVELS[level],
             "indicators": detected_indicators,
             "recommendation": recommendation,
             "platform_modifier": platform_modifier,
@@ -231,56 +703,110 @@ class RuleBasedDetector:
     
     def analyze_url(self, url: str) -> Dict:
         """
-        Analyze a URL for potential fraud indicators
+        Analyze a URL for potential fraud indicators.
+        Results are cached and shared between callers, so treat them as read-only
+        """
+        key = self._url_cache_key(url)
+        result = self._url_results.get(key)
+        if result is None:
+            result = self._analyze_url(url)
+            self._url_results.put(key, result)
+        return result
+    
+    @staticmethod
+    def _url_cache_key(url: str) -> Tuple:
+        # Key on a digest (as _text_cache_key does) so long URLs are not kept alive by the cache
+        return (hashlib.sha1(url.encode("utf-8", "surrogatepass")).digest(), len(url))
+    
+    def _count_suspicious_url_patterns(self, url: str) -> int:
+        """
+        Return how many of the suspicious URL patterns match the URL
+        """
+        if self._url_hs_db is None:
+            return self._count_suspicious_url_patterns_re(url)
+        
+        matches = []
+        with self._url_hs_lock:
+            self._url_hs_db.scan(url.encode("utf-8", "surrogatepass"),
+                                 match_event_handler=_record_hyperscan_match, context=matches)
+        return len(matches)
+    
+    def _count_suspicious_url_patterns_re(self, url: str) -> int:
+        if not self._suspicious_url_union.search(url):
+            return 0
+        return sum(1 for pattern in self._suspicious_url_regexes if pattern.search(url))
+    
+    def _verify_hyperscan(self) -> None:
+        """
+        Drop a hyperscan database that disagrees with the automaton/re matchers on sample
+        inputs (each keyword and URL pattern, in and out of context, short and long), so a
+        pattern the engine mishandles costs speed rather than detections
         """
+        if self._keyword_hs_db is not None:
+            keywords = [keyword for _, _, keyword in self._keyword_hs_payloads]
+            samples = [", ".join(keywords)]
+            for keyword in keywords:
+                samples += [keyword, keyword.upper() + "!", "x" + keyword, keyword + "x"]
+            texts = [prefix + sample for prefix in _HYPERSCAN_PROBE_PREFIXES for sample in samples]
+            if any(self._find_keyword_hits_hyperscan(text) != self._find_keyword_hits(text.lower()) for text in texts):
+                self._keyword_hs_db = None
+        
+        if self._url_hs_db is not None:
+            samples = [sample for pattern in self.suspicious_url_patterns for sample in _regex_samples(pattern)]
+            samples += ["http://" + domain + "/" + "/".join(samples) for domain in self.known_fraudulent_domains]
+            urls = [prefix + sample for prefix in _HYPERSCAN_PROBE_PREFIXES for sample in samples]
+            if any(self._count_suspicious_url_patterns(url) != self._count_suspicious_url_patterns_re(url) for url in urls):
+                self._url_hs_db = None
+    
+    def _contains_fraudulent_domain(self, domain: str) -> bool:
+        """
+        Whether a known fraudulent domain appears anywhere in the domain, so look-alikes
+        such as "secure-bitcoin-doubler.com" and "bitcoin-doubler.com-verify.net" match too
+        """
+        return next(self._fraud_domain_automaton.iter(domain), None) is not None
+    
+    def _analyze_url(self, url: str) -> Dict:
         try:
             # Ensure URL has a scheme
             if not url.startswith(('http://', 'https://')):
                 url = 'http://' + url
                 
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc.lower()
+            # The domain (netloc) runs from after "://" to the first "/", "?" or "#"
+            netloc_start = url.index("://") + 3
+            netloc_end = len(url)
+            for separator in "/?#":
+                position = url.find(separator, netloc_start, netloc_end)
+                if position >= 0:
+                    netloc_end = position
+            domain = url[netloc_start:netloc_end].lower()
             
             # Check if domain is in known fraudulent list
             domain_risk = 0
-            for fraud_domain in self.known_fraudulent_domains:
-                if fraud_domain in domain:
-                    domain_risk = 80
-                    break
+            if self._contains_fraudulent_domain(domain):
+                domain_risk = 80
             
             # Check for suspicious URL patterns
-            url_risk = 0
-            for pattern in self.suspicious_url_patterns:
-                if re.search(pattern, url.lower()):
-                    url_risk += 15
+            url_risk = 15 * self._count_suspicious_url_patterns(url)
             
             # Check for IP addresses instead of domains
-            if re.match(r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}", domain):
+            if self._ip_address_re.match(domain):
                 url_risk += 20
             
             # Check for newly registered domains (simplified check for demo)
-            if any(x in domain for x in ['new', 'latest', '2024', '2025']):
+            if not self._new_domain_tokens.isdisjoint(self._domain_split_re.split(domain)):
                 url_risk += 10
             
             # Combine risks (cap at 100)
             total_risk = min(100, domain_risk + url_risk)
             
             # Determine risk level
-            if total_risk < 30:
-                risk_level = "low"
-                recommendation = "This URL does not appear to be associated with known fraud patterns."
-            elif total_risk < 70:
-                risk_level = "medium"
-                recommendation = "This URL shows some suspicious characteristics. Exercise caution."
-            else:
-                risk_level = "high"
-                recommendation = "This URL matches known fraudulent patterns. Avoid interacting with this site."
+            level = bisect.bisect_right(self._RISK_THRESHOLDS, total_risk)
             
             return {
                 "risk_score": total_risk,
-                "risk_level": risk_level,
+                "risk_level": self._RISK_LEVELS[level],
                 "domain": domain,
-                "recommendation": recommendation
+                "recommendation": self._URL_RECOMMENDATIONS[level]
             }
             
         except Exception as e:
@@ -289,92 +815,16 @@ class RuleBasedDetector:
     def check_advisor(self, name: str = None, registration_number: str = None) -> Dict:
         """
         Check if a financial advisor is legitimate
-        This is a mock implementation - in a real system, you would query regulatory databases
+        This is a mock implementation - in a real system, you would query regulatory databases.
+        Results are prebuilt and shared between callers, so treat them as read-only
         """
-        # Mock database of legitimate advisors (in reality, this would be an external API call)
-        legitimate_advisors = {
-            "registration_numbers": {
-                "IN123456": {"name": "John Smith", "status": "active", "type": "Equity Advisor", "valid_until": "2025-12-31"},
-                "IN654321": {"name": "Jane Doe", "status": "active", "type": "Research Analyst", "valid_until": "2024-11-15"},
-                "US789012": {"name": "Robert Brown", "status": "active", "type": "Investment Advisor", "valid_until": "2026-03-20"},
-                "IN987654": {"name": "Sarah Johnson", "status": "suspended", "type": "Wealth Manager", "valid_until": "2024-08-10"},
-                "IN246810": {"name": "Michael Chen", "status": "active", "type": "Portfolio Manager", "valid_until": "2025-06-30"},
-            },
-            "names": {
-                "john smith": "IN123456",
-                "jane doe": "IN654321",
-                "robert brown": "US789012",
-                "sarah johnson": "IN987654",
-                "michael chen": "IN246810",
-                "david wilson": None,  # Not registered
-                "emma thompson": None  # Not registered
-            }
-        }
-        
         if registration_number:
             # Check by registration number
-            advisor = legitimate_advisors["registration_numbers"].get(registration_number.upper())
-            if advisor:
-                risk_score = 10 if advisor["status"] == "active" else 70
-                risk_level = "low" if advisor["status"] == "active" else "high"
-                
-                recommendation = f"This advisor is registered and {advisor['status']}. "
-                if advisor["status"] == "active":
-                    recommendation += f"Registration valid until {advisor['valid_until']}."
-                else:
-                    recommendation += "Do not engage with suspended advisors."
-                
-                return {
-                    "registered": advisor["status"] == "active",
-                    "status": advisor["status"],
-                    "details": advisor,
-                    "risk_score": risk_score,
-                    "risk_level": risk_level,
-                    "recommendation": recommendation
-                }
-            else:
-                return {
-                    "registered": False,
-                    "status": "not_found",
-                    "risk_score": 90,
-                    "risk_level": "high",
-                    "recommendation": "This registration number was not found in our database. Verify with official regulatory authorities."
-                }
+            return self._ADVISOR_RESULTS_BY_REG.get(registration_number.upper(), self._REG_NOT_FOUND_RESULT)
         
         elif name:
-            # Check by name
-            normalized_name = name.lower().strip()
-            registration_id = legitimate_advisors["names"].get(normalized_name)
-            
-            if registration_id:
-                advisor = legitimate_advisors["registration_numbers"].get(registration_id)
-                if advisor:
-                    risk_score = 15 if advisor["status"] == "active" else 75
-                    risk_level = "low" if advisor["status"] == "active" else "high"
-                    
-                    recommendation = f"This advisor is registered and {advisor['status']}. "
-                    if advisor["status"] == "active":
-                        recommendation += f"Registration valid until {advisor['valid_until']}."
-                    else:
-                        recommendation += "Do not engage with suspended advisors."
-                    
-                    return {
-                        "registered": advisor["status"] == "active",
-                        "status": advisor["status"],
-                        "details": advisor,
-                        "risk_score": risk_score,
-                        "risk_level": risk_level,
-                        "recommendation": recommendation
-                    }
-            
-            # Name not found or not registered
-            return {
-                "registered": False,
-                "status": "not_found",
-                "risk_score": 80,
-                "risk_level": "high",
-                "recommendation": "This advisor name was not found in our database. Verify with official regulatory authorities."
-            }
+            # Check by name (unknown and unregistered names get the not-found result)
+            return self._ADVISOR_RESULTS_BY_NAME.get(name.lower().strip(), self._NAME_NOT_FOUND_RESULT)
         
         else:
             return {"error": "Either name or registration number must be provided"}
@@ -405,7 +855,7 @@ if __name__ == "__main__":
     print(f"Recommendation: {result['recommendation']}")
     print("\nDetected Indicators:")
     for indicator in result['indicators']:
-        print(f"- {indicator['description']} (Weight: {indicator['weight']})")
+        print(f"- {indicator.description} (Weight: {indicator.weight})")
     
     # Test URL analysis
     print("\n" + "="*50)
@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from app import app, get_detector
+from config import Config
+from rule_based_detector import RuleBasedDetector, _has_excessive_caps
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return RuleBasedDetector(cache_size=0)
+
+
+def _indicator_names(result):
+    return {indicator.pattern for indicator in result["indicators"]}
+
+
+@pytest.mark.parametrize("payload, status", [
+    ({"items": "act now"}, 400),
+    ({"items": []}, 400),
+    ({"items": [{"text": "act now"}, "act now"]}, 400),
+    ({"items": [{"text": "act now"}, {"text": ""}]}, 400),
+    ({"items": [{"text": "act now"}] * (Config.MAX_BATCH_ITEMS + 1)}, 413),
+    ({"items": [{"text": "x" * (Config.MAX_TEXT_LENGTH + 1)}]}, 413),
+])
+def test_batch_rejects_invalid_items(client, payload, status):
+    response = client.post("/api/analyze/batch", json=payload)
+    assert response.status_code == status
+    assert "error" in response.get_json()
+
+
+def test_batch_results_match_single_text_analysis(client):
+    items = [
+        {"text": "Act now! Guaranteed returns, no risk. Wire transfer only.", "source_platform": "telegram",
+         "content_type": "investment_advice"},
+        {"text": "Past performance is not indicative of future results. SEC registered.",
+         "source_platform": "exchange", "content_type": "document"},
+        {"text": "Quarterly results are out today."},
+        {"text": "ELON MUSK SAYS BUY NOW!!"},
+    ]
+    response = client.post("/api/analyze/batch", json={"items": items})
+    assert response.status_code == 200
+    batch_results = response.get_json()["results"]
+
+    for item, batch_result in zip(items, batch_results):
+        single = client.post("/api/analyze/text", json=item)
+        assert single.status_code == 200
+        assert batch_result == single.get_json()
+
+
+def test_batch_matches_analyze_text_uncached(detector):
+    texts = ["Act now, no risk!!", "Call 555-123-4567 to verify our license number", "hello there"]
+    cached_results = get_detector().analyze_batch(texts)
+    assert cached_results == [detector.analyze_text(text) for text in texts]
+
+
+def test_contact_heavy_text_stops_at_first_category_match(detector):
+    # Every phone number matches the contact regex; scanning them one by one took ~30 ms under RE2
+    text = " ".join(f"555-123-{i:04d}" for i in range(5400))[:Config.MAX_TEXT_LENGTH]
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        result = detector.analyze_text(text)
+        timings.append(time.perf_counter() - start)
+    assert _indicator_names(result) == {"contact_information"}
+    assert min(timings) < 0.01
+
+
+def test_keywords_only_match_whole_tokens(detector):
+    assert "high_returns_promise" in _indicator_names(detector.analyze_text("This carries no risk at all"))
+    assert "high_returns_promise" not in _indicator_names(detector.analyze_text("Did you know risk is part of investing"))
+    assert "registered_entities" not in _indicator_names(detector.analyze_text("Insensetive pricing"))
+
+
+def test_excessive_caps_needs_enough_uppercase_letters():
+    assert _has_excessive_caps("THIS IS A ONCE IN A LIFETIME DEAL")
+    assert not _has_excessive_caps("NASA")
+    assert not _has_excessive_caps("Listed on the NSE and BSE since 2010")
+
+
+@pytest.mark.parametrize("url", [
+    "www.bitcoin-doubler.com",
+    "https://bitcoin-doubler.com.example.net/",
+    "login-getrichquick.org",
+    "secure-bitcoin-doubler.com",
+    "bitcoin-doubler.com-verify.net",
+])
+def test_fraudulent_domains_match_anywhere_in_domain(detector, url):
+    assert detector.analyze_url(url)["risk_score"] >= 80
+
+
+def test_url_too_long_is_rejected(client):
+    response = client.post("/api/analyze/url", json={"url": "http://example.com/" + "a" * Config.MAX_URL_LENGTH})
+    assert response.status_code == 413
@@ -0,0 +1,6 @@
+# Gunicorn's gevent worker monkey-patches the stdlib itself before loading this module,
+# so nothing is patched here and sync workers keep the plain blocking socket module
+from app import app
+
+if __name__ == '__main__':
+    app.run(port=8000)